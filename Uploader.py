@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import math
 import os
+import re
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, Path as ApiPath
-from pydantic import BaseModel, Field, constr
+from pydantic import AfterValidator, BaseModel, Field
+
+try:
+    import orjson  # optional: much faster serialization than stdlib json
+except ImportError:  # pragma: no cover
+    orjson = None
 
 # -------------------------------------------------------------------
 # Config
@@ -26,7 +36,22 @@ ACCOUNT_FILENAMES: Dict[str, str] = {
     "account_summary": "account_summary.json",
 }
 
-VALID_ACCOUNT = constr(pattern=r"^[A-Za-z0-9_\-]+$")
+# Blocking file writes run here, off the event loop, so slow disks (fsync, backups)
+# don't tie up Starlette's shared threadpool. Bundle domains are written in parallel.
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="json-writer")
+
+_ACCOUNT_ID_RE = re.compile(r"[A-Za-z0-9_\-]+", re.ASCII)
+_ACCOUNT_ID_MAX_LEN = 128
+
+
+def _check_account_id(value: str) -> str:
+    # cheap C-level checks reject most bad input before the regex runs
+    if not (len(value) <= _ACCOUNT_ID_MAX_LEN and value.isascii() and _ACCOUNT_ID_RE.fullmatch(value)):
+        raise ValueError(f"accountId must be 1-{_ACCOUNT_ID_MAX_LEN} characters of A-Z, a-z, 0-9, '_' or '-'")
+    return value
+
+
+VALID_ACCOUNT = Annotated[str, AfterValidator(_check_account_id)]
 
 # -------------------------------------------------------------------
 # Models
@@ -43,53 +68,140 @@ class UploadBundle(BaseModel):
         default=True,
         description="Create a timestamped .bak before overwriting existing files",
     )
-    indent: int = Field(default=2, ge=0, le=8, description="JSON pretty-print indent")
+    indent: int = Field(default=0, ge=0, le=8, description="JSON pretty-print indent (0 = compact)")
+    fsync: bool = Field(
+        default=False,
+        description="Flush file data to disk before the atomic replace (slower, durable)",
+    )
 
 
 class SingleUpload(BaseModel):
     accountId: VALID_ACCOUNT
     data: Any
     backup_existing: bool = True
-    indent: int = 2
+    indent: int = 0
+    fsync: bool = False
 
 
 # -------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------
-def _account_dir(account_id: str) -> Path:
+# fdatasync skips the metadata flush; not available on macOS/Windows.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+@lru_cache(maxsize=1024)
+def _account_paths(account_id: str) -> Tuple[Path, Dict[str, Path]]:
+    """
+    Create the account folder once and cache it with its per-domain file Paths,
+    so repeat requests skip the mkdir/stat syscalls.
+    """
     p = ACCOUNT_DATA_DIR / account_id
     p.mkdir(parents=True, exist_ok=True)
-    return p
+    return p, {d: p / f for d, f in ACCOUNT_FILENAMES.items()}
+
+
+def _account_dir(account_id: str) -> Path:
+    return _account_paths(account_id)[0]
 
 
 def _target_path(account_id: str, domain: str) -> Path:
     if domain not in ACCOUNT_FILENAMES:
         raise HTTPException(status_code=400, detail=f"Unsupported domain '{domain}'. Allowed: {sorted(ACCOUNT_FILENAMES)}")
-    return _account_dir(account_id) / ACCOUNT_FILENAMES[domain]
+    return _account_paths(account_id)[1][domain]
+
+
+def _has_non_finite(payload: Any) -> bool:
+    """True if payload contains a NaN/Infinity float anywhere."""
+    stack = [payload]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, float):
+            if not math.isfinite(obj):
+                return True
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return False
 
 
-def _atomic_write_json(target: Path, payload: Any, *, indent: int = 2, backup_existing: bool = True) -> Tuple[str, int]:
+def _dumps(payload: Any, *, indent: int = 0) -> bytes:
+    """
+    Serialize payload to UTF-8 JSON bytes.
+    Uses orjson when installed (indent > 0 -> 2-space indent, 0 -> compact),
+    otherwise stdlib json. Also falls back to stdlib json for payloads orjson
+    would reject or alter: integers beyond 64 bits (orjson raises) and
+    NaN/Infinity (orjson writes null).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            out = orjson.dumps(payload, option=option)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # non-finite floats come out as null, so only scan when there is one
+            if b"null" not in out or not _has_non_finite(payload):
+                return out
+    return json.dumps(payload, ensure_ascii=False, indent=indent or None).encode("utf-8")
+
+
+def _atomic_write_json(
+    target: Path,
+    payload: Any,
+    *,
+    indent: int = 0,
+    backup_existing: bool = True,
+    fsync: bool = False,
+) -> Tuple[str, int]:
     """
     Write JSON atomically: temp file -> replace.
     Optionally create a timestamped backup of the existing file.
+    With fsync=True the temp file's data is synced (fdatasync where available)
+    before the replace; otherwise only the rename itself is atomic.
     Returns (status, byte_count).
     """
-    target.parent.mkdir(parents=True, exist_ok=True)
+    # Serialize first so an unencodable payload fails before touching the disk
+    data = _dumps(payload, indent=indent)
 
     if backup_existing and target.exists():
         ts = time.strftime("%Y%m%d-%H%M%S")
         backup = target.with_suffix(target.suffix + f".{ts}.bak")
-        shutil.copy2(target, backup)
+        # The old inode is never modified (os.replace swaps in a new file), so a
+        # hardlink preserves it without copying; fall back where links aren't possible.
+        try:
+            os.link(target, backup)
+        except OSError:
+            shutil.copy2(target, backup)
 
     # Write temp and then replace
-    with NamedTemporaryFile("w", encoding="utf-8", delete=False, dir=str(target.parent)) as tf:
-        json.dump(payload, tf, ensure_ascii=False, indent=indent)
-        tf.flush()
-        os.fsync(tf.fileno())
-        temp_name = tf.name
+    try:
+        tf = NamedTemporaryFile("wb", delete=False, dir=str(target.parent))
+    except FileNotFoundError:
+        # Folder was removed behind the _account_paths cache; recreate it.
+        _account_paths.cache_clear()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tf = NamedTemporaryFile("wb", delete=False, dir=str(target.parent))
+
+    try:
+        with tf:
+            tf.write(data)
+            if fsync:
+                tf.flush()
+                _fdatasync(tf.fileno())
 
-    # Replace atomically on POSIX; Windows also OK with replace()
-    os.replace(temp_name, target)
+        # Replace atomically on POSIX; Windows also OK with replace()
+        os.replace(tf.name, target)
+    except BaseException:
+        # don't leave an orphaned tmp file in the account folder
+        try:
+            os.unlink(tf.name)
+        except OSError:
+            pass
+        raise
 
     size = target.stat().st_size if target.exists() else 0
     return ("updated" if target.exists() else "created", size)
@@ -114,23 +226,31 @@ app = FastAPI(title="Account JSON Uploader", version="1.0.0")
 
 
 @app.post("/api/context/v1/upload", summary="Upload multiple JSON domains for an account")
-def upload_bundle(bundle: UploadBundle):
+async def upload_bundle(bundle: UploadBundle):
     domains = _collect_domains(bundle)
     account_dir = _account_dir(bundle.accountId)
+    targets = {domain: _target_path(bundle.accountId, domain) for domain in domains}
 
-    results = {}
-    for domain, payload in domains.items():
-        target = _target_path(bundle.accountId, domain)
-        status, size = _atomic_write_json(
-            target,
+    # Fan out the writes; each domain goes to its own file so they don't contend.
+    loop = asyncio.get_running_loop()
+    written = await asyncio.gather(*(
+        loop.run_in_executor(UPLOAD_EXECUTOR, partial(
+            _atomic_write_json,
+            targets[domain],
             payload,
             indent=bundle.indent,
             backup_existing=bundle.backup_existing,
-        )
+            fsync=bundle.fsync,
+        ))
+        for domain, payload in domains.items()
+    ))
+
+    results = {}
+    for (domain, payload), (status, size) in zip(domains.items(), written):
         # Nicety: counts for array-like data
         count = len(payload) if isinstance(payload, list) else (len(payload) if isinstance(payload, dict) else None)
         results[domain] = {
-            "file": str(target),
+            "file": str(targets[domain]),
             "status": status,
             "size_bytes": size,
             "count": count,
@@ -147,17 +267,19 @@ def upload_bundle(bundle: UploadBundle):
     "/api/context/v1/upload/{domain}",
     summary="Upload a single JSON domain (transactions/payments/statements/account_summary) for an account",
 )
-def upload_single(
+async def upload_single(
     domain: str = ApiPath(..., description=f"One of: {', '.join(ACCOUNT_FILENAMES.keys())}"),
     payload: SingleUpload = ...,
 ):
     target = _target_path(payload.accountId, domain)
-    status, size = _atomic_write_json(
+    status, size = await asyncio.get_running_loop().run_in_executor(UPLOAD_EXECUTOR, partial(
+        _atomic_write_json,
         target,
         payload.data,
         indent=payload.indent,
         backup_existing=payload.backup_existing,
-    )
+        fsync=payload.fsync,
+    ))
     count = len(payload.data) if isinstance(payload.data, list) else (len(payload.data) if isinstance(payload.data, dict) else None)
     return {
         "accountId": payload.accountId,
@@ -171,6 +293,8 @@ def upload_single(
 
 @app.get("/api/context/v1/where/{accountId}", summary="Resolve account folder + expected files")
 def where(accountId: VALID_ACCOUNT):
-    base = _account_dir(accountId)
-    files = {d: str((base / f).resolve()) for d, f in ACCOUNT_FILENAMES.items()}
+    # Cached Paths are already absolute (ACCOUNT_DATA_DIR is resolved and accountId
+    # can't contain separators), so no per-call joins or resolve() syscalls.
+    base, targets = _account_paths(accountId)
+    files = {d: str(p) for d, p in targets.items()}
     return {"accountId": accountId, "account_dir": str(base), "files": files}
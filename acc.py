@@ -1,12 +1,22 @@
 # core/data/accounts.py
 from __future__ import annotations
-import json, re
-from functools import lru_cache
+import json, os, re, threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Tuple
 
 from core.config.settings import ACCOUNT_DATA_DIR
 
+try:
+    import orjson  # optional: faster parsing than stdlib json
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import simdjson  # optional: lazy (on-demand) parsing for read-only access
+except ImportError:  # pragma: no cover
+    simdjson = None
+
 # Filenames we expect inside each account_id folder
 ACCOUNT_FILENAMES = {
     "transactions": "transactions.json",
@@ -15,11 +25,28 @@ ACCOUNT_FILENAMES = {
     "account_summary": "account_summary.json",
 }
 
-_id_ok = re.compile(r"^[A-Za-z0-9_\-]+$")  # sanitize folder name
+# load_account_bundle cache: account_id -> {domain: (mtime_ns, size, parsed)}.
+# Bounded by total on-disk bytes of the cached files, evicted LRU.
+_BUNDLE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_bundle_cache: "OrderedDict[str, Dict[str, Tuple[int, int, Any]]]" = OrderedDict()
+_bundle_cache_bytes = 0
+_bundle_cache_lock = threading.Lock()
+
+# One pysimdjson parser reused across eager loads when orjson isn't installed, so
+# its internal buffers carry over between parses instead of a new Parser per file.
+# max_capacity only caps document size. Parser isn't thread-safe; FastAPI serves
+# from a threadpool.
+_PARSER_CAPACITY = 64 * 1024 * 1024
+_PARSER = simdjson.Parser(max_capacity=_PARSER_CAPACITY) if simdjson is not None else None
+_parser_lock = threading.Lock()
+
+_ID_RE = re.compile(r"[A-Za-z0-9_\-]+", re.ASCII)  # sanitize folder name (use fullmatch)
+_ID_MAX_LEN = 128
 
 def _sanitize_account_id(account_id: str) -> str:
     account_id = account_id.strip()
-    if not _id_ok.match(account_id):
+    # cheap C-level checks reject most bad input before the regex runs
+    if not (len(account_id) <= _ID_MAX_LEN and account_id.isascii() and _ID_RE.fullmatch(account_id)):
         raise ValueError(f"Invalid account_id: {account_id!r}")
     return account_id
 
@@ -27,39 +54,134 @@ def account_dir(account_id: str) -> Path:
     """Return the folder Path for this account_id (does not create it)."""
     return ACCOUNT_DATA_DIR / _sanitize_account_id(account_id)
 
+def _account_file_strs(account_id: str) -> Dict[str, str]:
+    """
+    get_account_paths as plain strings, for internal hot paths that only need
+    to stat/open the files. Raises if the directory doesn’t exist.
+    """
+    base = f"{ACCOUNT_DATA_DIR}/{_sanitize_account_id(account_id)}"
+    if not os.path.isdir(base):
+        raise FileNotFoundError(f"Account folder not found: {base}")
+    return {k: f"{base}/{fname}" for k, fname in ACCOUNT_FILENAMES.items()}
+
 def get_account_paths(account_id: str) -> Dict[str, Path]:
     """
     Return absolute Paths for all four json files for this account_id,
     without reading them. Raises if the directory doesn’t exist.
     """
-    base = account_dir(account_id)
-    if not base.exists() or not base.is_dir():
-        raise FileNotFoundError(f"Account folder not found: {base}")
-    return {k: base / fname for k, fname in ACCOUNT_FILENAMES.items()}
+    return {k: Path(p) for k, p in _account_file_strs(account_id).items()}
+
+# orjson and simdjson only handle integers up to 64 bits (orjson silently returns
+# larger ones as floats) and reject NaN/Infinity, which stdlib json writes. Any run
+# of 20+ digits might not fit in 64 bits, so those files skip the fast parsers.
+_WIDE_NUMBER_RE = re.compile(rb"\d{20}")
+
+def _load_json(p: str | Path) -> Any:
+    # Read the whole file as bytes and parse once: orjson, else the shared
+    # simdjson parser, else stdlib json (all accept bytes).
+    with open(p, "rb") as f:
+        raw = f.read()
+    if not _WIDE_NUMBER_RE.search(raw):
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN; let stdlib json handle (or report) it
+        elif _PARSER is not None and len(raw) <= _PARSER_CAPACITY:
+            # recursive=True builds plain dicts/lists, so nothing references the
+            # shared parser's document once the lock is released.
+            try:
+                with _parser_lock:
+                    return _PARSER.parse(raw, recursive=True)
+            except ValueError:
+                pass
+    return json.loads(raw)
+
+def _load_json_lazy(p: str | Path) -> Any:
+    """
+    Parse with pysimdjson and return its Object/Array proxy; nodes become Python
+    objects only when accessed (.as_dict()/.as_list() materializes everything).
+    A simdjson Parser holds one live document at a time, so each file gets its own.
+    Falls back to _load_json when pysimdjson isn't installed or can't parse the file.
+    """
+    if simdjson is None:
+        return _load_json(p)
+    try:
+        return simdjson.Parser().load(str(p))
+    except (ValueError, RuntimeError):
+        # NaN/Infinity or >64-bit integers: load eagerly through stdlib json
+        return _load_json(p)
+
+def _stat_account_files(account_id: str) -> Tuple[Dict[str, str], Dict[str, Tuple[int, int]]]:
+    """
+    Return (paths, {domain: (mtime_ns, size)}) for the four files.
+    Raises FileNotFoundError if any of them is missing.
+    """
+    paths = _account_file_strs(account_id)
+    stats: Dict[str, Tuple[int, int]] = {}
+    missing = []
+    for k, p in paths.items():
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            missing.append(k)
+        else:
+            stats[k] = (st.st_mtime_ns, st.st_size)
+    if missing:
+        details = ", ".join(f"{k}→{paths[k]}" for k in missing)
+        raise FileNotFoundError(f"Missing required file(s) for {account_id}: {details}")
+    return paths, stats
 
-def _load_json(p: Path) -> Any:
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+def _cache_put(key: str, files: Dict[str, Tuple[int, int, Any]]) -> None:
+    global _bundle_cache_bytes
+    old = _bundle_cache.pop(key, None)
+    if old is not None:
+        _bundle_cache_bytes -= sum(f[1] for f in old.values())
+    size = sum(f[1] for f in files.values())
+    if size > _BUNDLE_CACHE_MAX_BYTES:
+        return
+    _bundle_cache[key] = files
+    _bundle_cache_bytes += size
+    while _bundle_cache_bytes > _BUNDLE_CACHE_MAX_BYTES:
+        _, evicted = _bundle_cache.popitem(last=False)
+        _bundle_cache_bytes -= sum(f[1] for f in evicted.values())
 
-@lru_cache(maxsize=256)
 def load_account_bundle(account_id: str) -> Dict[str, Any]:
     """
     Load and return the four JSON payloads for this account_id.
     Returns dict with keys: transactions, payments, statements, account_summary.
     If a file is missing, raises FileNotFoundError with a clear message.
+    Results are cached per file and re-parsed only when its mtime/size changes,
+    so uploads are picked up on the next call.
     """
-    paths = get_account_paths(account_id)
-    missing = [k for k, p in paths.items() if not p.exists()]
-    if missing:
-        details = ", ".join(f"{k}→{paths[k]}" for k in missing)
-        raise FileNotFoundError(f"Missing required file(s) for {account_id}: {details}")
+    paths, stats = _stat_account_files(account_id)
+    key = _sanitize_account_id(account_id)
+
+    with _bundle_cache_lock:
+        cached = _bundle_cache.get(key, {})
+
+    files: Dict[str, Tuple[int, int, Any]] = {}
+    for k, p in paths.items():
+        hit = cached.get(k)
+        if hit is not None and hit[:2] == stats[k]:
+            files[k] = hit
+        else:
+            files[k] = (*stats[k], _load_json(p))
 
-    return {
-        "transactions": _load_json(paths["transactions"]),
-        "payments": _load_json(paths["payments"]),
-        "statements": _load_json(paths["statements"]),
-        "account_summary": _load_json(paths["account_summary"]),
-    }
+    with _bundle_cache_lock:
+        _cache_put(key, files)
+
+    return {k: f[2] for k, f in files.items()}
+
+def load_account_bundle_lazy(account_id: str) -> Dict[str, Any]:
+    """
+    Read-only variant of load_account_bundle for callers that touch a few fields.
+    Values are pysimdjson Object/Array proxies (plain dicts/lists without pysimdjson);
+    call .as_dict()/.as_list() if you end up needing the whole payload.
+    Not cached, since proxies pin their parser's buffer.
+    """
+    paths, _ = _stat_account_files(account_id)
+    return {k: _load_json_lazy(p) for k, p in paths.items()}
 
 def try_load_account_bundle(account_id: str) -> Tuple[Dict[str, Any], Dict[str, Path]]:
     """
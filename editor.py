@@ -1,6 +1,7 @@
 from pathlib import Path
 import json
-from datetime import datetime
+
+import pandas as pd  # requires pandas>=2.0 for to_datetime(format="ISO8601")
 
 # --- Config ---
 STATEMENTS_FILE = Path("data/customer_data/1234567890/statements.json")  # ← update accountId here
@@ -9,7 +10,8 @@ def add_period_field(file_path: Path):
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    # Load JSON
+    # Load JSON. Stdlib json on purpose: this rewrites the file in place, and
+    # orjson would turn >64-bit integers into floats and reject NaN.
     with open(file_path, "r", encoding="utf-8") as f:
         statements = json.load(f)
 
@@ -18,19 +20,31 @@ def add_period_field(file_path: Path):
 
     updated_count = 0
 
+    # Parse all dates in one vectorized pass (ISO-8601); invalid ones become NaT.
+    # Drop "Z", then any numeric UTC offset after a time component, so every value
+    # is naive wall-clock time: the period keeps the local month and pandas never
+    # sees a mix of tz-aware and naive values.
+    opening_dates = pd.Series([stmt.get("openingDateTime") for stmt in statements], dtype="object")
+    parsed = pd.to_datetime(
+        opening_dates
+            .str.replace("Z", "", regex=False)
+            .str.replace(r"([T ]\d{2}(?::?\d{2}(?::?\d{2}(?:[.,]\d+)?)?)?)[+-]\d{2}(?::?\d{2})?$", r"\1", regex=True),
+        errors="coerce",
+        format="ISO8601",
+    )
+    periods = parsed.dt.strftime("%Y-%m")  # e.g. "2025-03"
+
     # Process each statement
-    for stmt in statements:
-        opening_date_str = stmt.get("openingDateTime")
+    for stmt, opening_date_str, period in zip(statements, opening_dates, periods):
         if not opening_date_str:
             continue
 
-        try:
-            # Try parsing date automatically (ISO-8601 or similar)
-            dt = datetime.fromisoformat(opening_date_str.replace("Z", ""))
-            stmt["period"] = dt.strftime("%Y-%m")  # e.g. "2025-03"
-            updated_count += 1
-        except ValueError:
+        if pd.isna(period):
             print(f"⚠️ Skipping invalid date: {opening_date_str}")
+            continue
+
+        stmt["period"] = period
+        updated_count += 1
 
     # Save updated JSON back
     with open(file_path, "w", encoding="utf-8") as f:
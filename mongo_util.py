@@ -1,9 +1,17 @@
 # mongo_db_utils.py
 import os
 import json
-from datetime import datetime
+import warnings
+from datetime import datetime, timezone
+
+from pymongo import MongoClient, ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+
+
+def _now_utc() -> datetime:
+    """Timezone-aware UTC now (replaces the deprecated datetime.utcnow())."""
+    return datetime.now(timezone.utc)
 
-from pymongo import MongoClient, DESCENDING
 
 # === Connection helpers ======================================================
 
@@ -24,17 +32,49 @@ def get_mongo_db():
     return db
 
 
-# === RELEASE TAGS ============================================================
+# (collection, keys, options) for every query/upsert key and sort field we use
+_INDEXES = [
+    ("release_tags",      [("projectId", ASCENDING)],   {"unique": True}),
+    ("release_tags",      [("created_at", DESCENDING)], {}),
+    ("confluence_info",   [("page_id", ASCENDING)],     {"unique": True}),
+    ("confluence_info",   [("created_at", DESCENDING)], {}),
+    ("integration_tests", [("schedule_id", ASCENDING)], {"unique": True}),
+]
 
-def insert_release_tag(db, project: dict, git_details: dict):
+
+def ensure_indexes(db):
     """
-    Upsert a release tag document in 'release_tags' collection using projectId as key.
-    Mirrors the SQLite INSERT ... ON CONFLICT(projectId) DO UPDATE.
+    Create the indexes backing our upsert filters and created_at sorts.
+    Call once at application startup (get_mongo_db() doesn't touch the network).
+
+    create_index is a no-op when the index already exists. An OperationFailure
+    (e.g. conflicting options or duplicate keys) skips that index only; any other
+    PyMongoError (e.g. server unreachable) stops early. Both emit a warning so a
+    missing index doesn't go unnoticed.
     """
-    coll = db["release_tags"]
-    now = datetime.utcnow()
+    for coll_name, keys, opts in _INDEXES:
+        try:
+            db[coll_name].create_index(keys, **opts)
+        except OperationFailure as exc:
+            warnings.warn(
+                f"Could not create index {keys} {opts} on '{coll_name}': {exc}",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        except PyMongoError as exc:
+            warnings.warn(
+                f"Skipping index creation, MongoDB unavailable: {exc}",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            return
+
+
+# === RELEASE TAGS ============================================================
 
-    doc_fields = {
+def _release_tag_fields(project: dict, git_details: dict) -> dict:
+    """Map a project + its git details onto the release_tags document fields."""
+    return {
         "projectId":            project["projectId"],
         "projectName":          project["projectName"],
         "projectDisplayName":   project["projectDisplayName"],
@@ -48,19 +88,54 @@ def insert_release_tag(db, project: dict, git_details: dict):
         "current_deployed_tag_prod_pipeline": git_details["current_deployed_tag_pipeline"],
         "diff_url":            git_details["diff_url"],
         # in SQLite this was TEXT(JSON). In Mongo we'll keep it as list directly.
-        "jira_issue_list":      git_details.get("jira_issue_list", []),
+        "jira_issue_list":      git_details.get("jira_issue_list") or [],
     }
 
+
+def insert_release_tag(db, project: dict, git_details: dict):
+    """
+    Upsert a release tag document in 'release_tags' collection using projectId as key.
+    Mirrors the SQLite INSERT ... ON CONFLICT(projectId) DO UPDATE.
+    """
+    coll = db["release_tags"]
+    now = _now_utc()
+
     coll.update_one(
         {"projectId": project["projectId"]},
         {
-            "$set": {**doc_fields, "updated_at": now},
+            "$set": {**_release_tag_fields(project, git_details), "updated_at": now},
             "$setOnInsert": {"created_at": now},
         },
         upsert=True,
     )
 
 
+def insert_release_tags_bulk(db, items: list[tuple[dict, dict]]):
+    """
+    Batch version of insert_release_tag for a list of (project, git_details) pairs.
+    Sends all upserts in one unordered bulk_write instead of one round-trip each.
+    Unordered ops may run in any order, so repeated projectIds are collapsed
+    first (last one wins, same as calling insert_release_tag in a loop).
+    """
+    latest = {project["projectId"]: (project, git_details) for project, git_details in items}
+    if not latest:
+        return None
+
+    now = _now_utc()
+    ops = [
+        UpdateOne(
+            {"projectId": project_id},
+            {
+                "$set": {**_release_tag_fields(project, git_details), "updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
+        for project_id, (project, git_details) in latest.items()
+    ]
+    return db["release_tags"].bulk_write(ops, ordered=False)
+
+
 def update_release_tag_deployment_status(db, project_id: str, status: str, patuat_deploy_status: str):
     """
     UPDATE release_tags
@@ -68,7 +143,7 @@ def update_release_tag_deployment_status(db, project_id: str, status: str, patua
      WHERE projectId=?
     """
     coll = db["release_tags"]
-    now = datetime.utcnow()
+    now = _now_utc()
 
     coll.update_one(
         {"projectId": project_id},
@@ -96,42 +171,56 @@ def update_release_tags(
     Mirrors the SQLite UPDATE that also merges JIRA issue lists.
     """
     coll = db["release_tags"]
-    now = datetime.utcnow()
-
-    # current Jira issues from DB
-    existing = coll.find_one({"projectId": projectId}, {"jira_issue_list": 1})
-    combined = set()
-
-    if jira_issue_list:
-        combined.update(jira_issue_list)
-
-    if existing and existing.get("jira_issue_list"):
-        combined.update(existing["jira_issue_list"])
-
-    combined_list = list(combined)
+    now = _now_utc()
 
+    # Pipeline update so the Jira merge happens server-side in the same atomic
+    # write: $ifNull treats a stored null/missing list as [], which $addToSet can't.
+    # Caller values go through $literal so a leading "$" isn't read as a field path.
     coll.update_one(
         {"projectId": projectId},
-        {
+        [{
             "$set": {
-                "tag_name":           latest_tag,
-                "new_tag_status":     status,
-                "new_tag_pipeline":   new_tag_pipeline,
-                "pat_uat_deployment": patuat_deploy_status,
-                "diff_url":           diff_url,
-                "jira_issue_list":    combined_list,
+                "tag_name":           {"$literal": latest_tag},
+                "new_tag_status":     {"$literal": status},
+                "new_tag_pipeline":   {"$literal": new_tag_pipeline},
+                "pat_uat_deployment": {"$literal": patuat_deploy_status},
+                "diff_url":           {"$literal": diff_url},
+                "jira_issue_list": {
+                    "$setUnion": [
+                        {"$ifNull": ["$jira_issue_list", []]},
+                        {"$literal": list(jira_issue_list or [])},
+                    ]
+                },
                 "updated_at":         now,
             }
-        },
+        }],
     )
 
 
-def get_release_tags(db) -> list[dict]:
+# fields get_release_tags returns (_id is always included)
+_RELEASE_TAG_PROJECTION = {
+    field: 1
+    for field in (
+        "projectId", "projectName", "projectDisplayName", "projectType",
+        "project_web_url", "tag_name", "new_tag_status", "new_tag_pipeline",
+        "pat_uat_deployment", "current_deployed_tag_prod",
+        "current_deployed_tag_prod_pipeline", "diff_url", "jira_issue_list",
+        "created_at", "updated_at",
+    )
+}
+
+
+def get_release_tags(db, limit: int = 500, batch_size: int = 200) -> list[dict]:
     """
-    SELECT * FROM release_tags ORDER BY created_at DESC
+    SELECT * FROM release_tags ORDER BY created_at DESC LIMIT ?
+    With the created_at index the server stops after `limit` docs.
     """
     coll = db["release_tags"]
-    docs = coll.find().sort("created_at", DESCENDING)
+    docs = (
+        coll.find({}, _RELEASE_TAG_PROJECTION, batch_size=batch_size)
+        .sort("created_at", DESCENDING)
+        .limit(limit)
+    )
 
     results = []
     for d in docs:
@@ -157,34 +246,33 @@ def get_release_tags(db) -> list[dict]:
     return results
 
 
+def _unique_jira_issues(coll, match: dict) -> list[str]:
+    """
+    Union jira_issue_list across matching docs server-side ($unwind + $addToSet),
+    so only the final unique list comes back over the wire.
+    """
+    cursor = coll.aggregate([
+        {"$match": match},
+        {"$unwind": "$jira_issue_list"},
+        {"$group": {"_id": None, "issues": {"$addToSet": "$jira_issue_list"}}},
+    ])
+    return next(cursor, {}).get("issues", [])
+
+
 def get_all_unique_jira_issues(db) -> list[str]:
     """
     SELECT DISTINCT jira_issue_list FROM release_tags;
     In SQLite this was JSON TEXT => flattened to unique list.
     Here they are stored as arrays already.
     """
-    coll = db["release_tags"]
-    unique = set()
-
-    for d in coll.find({}, {"jira_issue_list": 1}):
-        issues = d.get("jira_issue_list") or []
-        unique.update(issues)
-
-    return list(unique)
+    return _unique_jira_issues(db["release_tags"], {})
 
 
 def get_all_unique_jira_issues_by_project(db, projectId: str) -> list[str]:
     """
     SELECT DISTINCT jira_issue_list FROM release_tags WHERE projectId=?;
     """
-    coll = db["release_tags"]
-    unique = set()
-
-    for d in coll.find({"projectId": projectId}, {"jira_issue_list": 1}):
-        issues = d.get("jira_issue_list") or []
-        unique.update(issues)
-
-    return list(unique)
+    return _unique_jira_issues(db["release_tags"], {"projectId": projectId})
 
 
 # === CONFLUENCE INFO =========================================================
@@ -195,7 +283,7 @@ def insert_confluence_info(db, confluence_id: str, space_key: str, parent_page_i
     ON CONFLICT(page_id) ... (we just upsert by page_id).
     """
     coll = db["confluence_info"]
-    now = datetime.utcnow()
+    now = _now_utc()
 
     coll.update_one(
         {"page_id": confluence_id},
@@ -246,7 +334,7 @@ def insert_integration_test_data(
     INSERT INTO integration_tests(...) ON CONFLICT(schedule_id) DO UPDATE ...
     """
     coll = db["integration_tests"]
-    now = datetime.utcnow()
+    now = _now_utc()
 
     coll.update_one(
         {"schedule_id": schedule_id},